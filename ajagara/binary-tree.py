@@ -1,5 +1,19 @@
+"""
+Binary Search Tree traversals - inorder, preorder, postorder, level order
+plus the practical applications each one is good for.
+
+⚡ PERFORMANCE: Everything here is pure Python with no dependencies.
+For large trees run under PyPy3; expected 5-20x speedup on traversals
+with no changes. TreeNode stays a plain class on purpose - wrapping it in
+Numba's @jitclass compiles slowly and pays off poorly for pointer-chasing.
+"""
+
+import sys
+
 class TreeNode:
     """Simple BST node with value and left/right pointers"""
+    __slots__ = ("val", "left", "right")  # No per-node __dict__
+    
     def __init__(self, val=0, left=None, right=None):
         self.val = val
         self.left = left
@@ -7,43 +21,165 @@ class TreeNode:
 
 class BST:
     def __init__(self):
-        self.root = None
+        self._root = None
+        self._size = 0       # Node count, kept up to date by insert
+    
+    @property
+    def root(self):
+        return self._root
+    
+    @root.setter
+    def root(self, node):
+        """Assigning a new root recounts its nodes so size stays correct"""
+        self._root = node
+        count = 0
+        stack = [node] if node is not None else []
+        while stack:
+            node = stack.pop()
+            count += 1
+            if node.left is not None:
+                stack.append(node.left)
+            if node.right is not None:
+                stack.append(node.right)
+        self._size = count
     
     def insert(self, val):
         """Insert maintaining BST property: left < root < right"""
-        self.root = self._insert_recursive(self.root, val)
-    
-    def _insert_recursive(self, node, val):
-        if not node:
-            return TreeNode(val)
+        self._size += 1
+        new = TreeNode(val)
+        if not self._root:
+            self._root = new
+            return
         
-        if val < node.val:
-            node.left = self._insert_recursive(node.left, val)
-        else:
-            node.right = self._insert_recursive(node.right, val)
+        # Walk down to the empty slot and attach there with a single store
+        node = self._root
+        while True:
+            if val < node.val:
+                if node.left is None:
+                    node.left = new
+                    return
+                node = node.left
+            else:
+                if node.right is None:
+                    node.right = new
+                    return
+                node = node.right
+    
+    @classmethod
+    def from_sorted(cls, sorted_vals):
+        """
+        Build a perfectly balanced BST from strictly ascending values in O(n)
+        Each subtree root is the median of its slice; iterative, so no
+        recursion limit on large inputs
+        """
+        bst = cls()
+        bst._size = len(sorted_vals)
+        if not sorted_vals:
+            return bst
         
-        return node
+        # Each entry: (lo, hi, parent, attach_left) for a slice still to build
+        stack = [(0, len(sorted_vals) - 1, None, False)]
+        while stack:
+            lo, hi, parent, attach_left = stack.pop()
+            mid = (lo + hi) // 2
+            node = TreeNode(sorted_vals[mid])
+            if parent is None:
+                bst._root = node
+            elif attach_left:
+                parent.left = node
+            else:
+                parent.right = node
+            
+            # Push right first so the left slice is built first (preorder)
+            if mid < hi:
+                stack.append((mid + 1, hi, node, False))
+            if lo < mid:
+                stack.append((lo, mid - 1, node, True))
+        return bst
+    
+    @property
+    def size(self):
+        """Number of nodes, O(1) - maintained by insert/from_sorted/root"""
+        return self._size
+    
+    # Traversal wrappers over the whole tree
+    def inorder(self):
+        return inorder_traversal(self.root)
+    
+    def preorder(self):
+        return preorder_traversal(self.root)
+    
+    def postorder(self):
+        # Known size lets postorder fill back to front, no reversal stack
+        return postorder_traversal(self.root, self._size)
+    
+    def level_order(self):
+        return level_order_traversal(self.root)
 
 # ============================================================================
 # TRAVERSAL METHODS - Each serves different purposes!
 # ============================================================================
 
+def _check_filled(count, size):
+    """Pre-sized traversals: the walk must have filled exactly `size` slots"""
+    if count != size:
+        raise ValueError(f"size={size} but the tree has {count} nodes")
+
 def inorder_traversal(root):
     """
     INORDER: Left → Root → Right
     🎯 USE CASE: Get sorted elements from BST
     📊 OUTPUT: Always sorted ascending order for BST
     ⏰ COMPLEXITY: O(n) time, O(h) space (h = height)
+    💡 ITERATIVE: Explicit stack, no recursion limit on deep trees
     """
     result = []
+    append = result.append
+    stack = []
+    push, pop = stack.append, stack.pop  # Hoist method lookups out of loop
+    node = root
     
-    def inorder_helper(node):
-        if node:
-            inorder_helper(node.left)    # Visit left subtree first
-            result.append(node.val)      # Process current node
-            inorder_helper(node.right)   # Visit right subtree last
+    while node is not None or stack:
+        while node is not None:          # Walk down the left spine first
+            push(node)
+            node = node.left
+        node = pop()
+        append(node.val)                 # Process current node
+        node = node.right                # Then visit right subtree
+    
+    return result
+
+def inorder_morris(root):
+    """
+    MORRIS INORDER: Left → Root → Right without a stack
+    🎯 USE CASE: Sorted output from very deep/skewed trees
+    ⏰ COMPLEXITY: O(n) time, O(1) extra space
+    ⚠️ THREADING: Temporarily points each inorder predecessor's empty right
+       link back at its successor; every such link is removed again before
+       the walk finishes, so the tree is left exactly as it was found
+    """
+    result = []
+    cur = root
+    
+    while cur:
+        if cur.left is None:
+            result.append(cur.val)
+            cur = cur.right
+            continue
+        
+        # Find inorder predecessor: rightmost node of the left subtree
+        pred = cur.left
+        while pred.right and pred.right is not cur:
+            pred = pred.right
+        
+        if pred.right is None:
+            pred.right = cur             # Thread back to cur, then go left
+            cur = cur.left
+        else:
+            pred.right = None            # Left subtree done: restore link
+            result.append(cur.val)
+            cur = cur.right
     
-    inorder_helper(root)
     return result
 
 def preorder_traversal(root):
@@ -53,35 +189,83 @@ def preorder_traversal(root):
     📊 OUTPUT: Root comes first, then subtrees
     ⏰ COMPLEXITY: O(n) time, O(h) space
     💡 MEMORY: Good for reconstructing tree from traversal
+    💡 ITERATIVE: Push right then left so left is popped first
     """
+    if not root:
+        return []
+    
     result = []
+    append = result.append
+    stack = [root]
+    push, pop = stack.append, stack.pop  # Hoist method lookups out of loop
     
-    def preorder_helper(node):
-        if node:
-            result.append(node.val)      # Process current node FIRST
-            preorder_helper(node.left)   # Then left subtree
-            preorder_helper(node.right)  # Finally right subtree
+    while stack:
+        node = pop()
+        append(node.val)                 # Process current node FIRST
+        left, right = node.left, node.right  # One attribute load each
+        if right is not None:            # Push right first so left pops first
+            push(right)
+        if left is not None:
+            push(left)
     
-    preorder_helper(root)
     return result
 
-def postorder_traversal(root):
+def postorder_traversal(root, size=None):
     """
     POSTORDER: Left → Right → Root
     🎯 USE CASE: Delete tree safely, calculate tree size/height
     📊 OUTPUT: Children processed before parent
-    ⏰ COMPLEXITY: O(n) time, O(h) space
+    ⏰ COMPLEXITY: O(n) time, O(n) space
     💡 MEMORY: Safe for operations that need children done first
+    💡 ITERATIVE: Two stacks, O(n) space for the reversal stack
+    💡 SIZE: With a known node count the result is filled back to front,
+       so the reversal stack is not needed at all; it must match the tree
+       exactly or ValueError is raised
     """
-    result = []
+    if not root:
+        if size:
+            _check_filled(0, size)
+        return []
+    
+    # Walking Root → Right → Left gives postorder read backwards
+    s1 = [root]
+    push, pop = s1.append, s1.pop        # Hoist method lookups out of loop
+    
+    if size is not None:
+        result = [None] * size
+        i = size
+        while s1:
+            node = pop()
+            i -= 1
+            if i < 0:                    # Never wrap into negative indices
+                raise ValueError(f"size={size} is smaller than the tree")
+            result[i] = node.val
+            left, right = node.left, node.right  # One attribute load each
+            if left is not None:
+                push(left)
+            if right is not None:
+                push(right)
+        _check_filled(size - i, size)
+        return result
     
-    def postorder_helper(node):
-        if node:
-            postorder_helper(node.left)   # Process left subtree first
-            postorder_helper(node.right)  # Process right subtree second
-            result.append(node.val)       # Process current node LAST
+    # Two-stack trick: s1 yields Root → Right → Left, s2 reverses it
+    s2 = []
+    push2 = s2.append
+    
+    while s1:
+        node = pop()
+        push2(node)
+        left, right = node.left, node.right
+        if left is not None:
+            push(left)
+        if right is not None:
+            push(right)
+    
+    result = []
+    append, pop2 = result.append, s2.pop
+    while s2:
+        append(pop2().val)               # Children drained before parent
     
-    postorder_helper(root)
     return result
 
 def level_order_traversal(root):
@@ -89,27 +273,26 @@ def level_order_traversal(root):
     LEVEL ORDER: Visit nodes level by level (BFS)
     🎯 USE CASE: Print tree by levels, find shortest path
     📊 OUTPUT: Level 0, then level 1, then level 2, etc.
-    ⏰ COMPLEXITY: O(n) time, O(w) space (w = max width)
-    💡 ITERATIVE: Uses queue instead of recursion
+    ⏰ COMPLEXITY: O(n) time, O(n) space (queue keeps visited nodes)
+    💡 ITERATIVE: Plain list as queue - iterating a list while appending
+       to it visits the new items too, so no deque or read cursor needed
     """
     if not root:
         return []
     
-    from collections import deque
-    result = []
-    queue = deque([root])
+    queue = [root]
+    enqueue = queue.append
     
-    while queue:
-        node = queue.popleft()
-        result.append(node.val)
-        
+    for node in queue:
         # Add children to queue for next level processing
-        if node.left:
-            queue.append(node.left)
-        if node.right:
-            queue.append(node.right)
+        left, right = node.left, node.right  # One attribute load each
+        if left is not None:
+            enqueue(left)
+        if right is not None:
+            enqueue(right)
     
-    return result
+    # The queue already holds every node in BFS order
+    return [node.val for node in queue]
 
 # ============================================================================
 # PRACTICAL APPLICATIONS OF EACH TRAVERSAL
@@ -119,32 +302,57 @@ def validate_bst(root):
     """
     🔍 INORDER APPLICATION: Validate if tree is actually a BST
     Logic: Inorder of valid BST must be strictly ascending
+    💡 STREAMING: Compares during the walk, stops at first violation
     """
-    inorder_vals = inorder_traversal(root)
+    prev = None                          # Previous node in inorder
+    stack = []
+    push, pop = stack.append, stack.pop
+    node = root
     
-    # Check if inorder sequence is sorted (BST property)
-    for i in range(1, len(inorder_vals)):
-        if inorder_vals[i] <= inorder_vals[i-1]:
+    while node is not None or stack:
+        while node is not None:
+            push(node)
+            node = node.left
+        node = pop()
+        
+        # Each inorder value must beat the previous one (BST property)
+        if prev is not None and node.val <= prev.val:
             return False
+        prev = node
+        node = node.right
     return True
 
 def serialize_tree(root):
     """
     💾 PREORDER APPLICATION: Serialize tree to string
     Logic: Root first allows easy reconstruction
+    💡 MEMORY: Collects tokens in a list and joins once (no O(n²) copies)
     """
-    def serialize_helper(node):
-        if not node:
-            return "null"
-        return f"{node.val},{serialize_helper(node.left)},{serialize_helper(node.right)}"
+    parts = []
+    append = parts.append
+    stack = [root]
+    push, pop = stack.append, stack.pop
+    
+    while stack:
+        node = pop()
+        if node is None:
+            append("null")
+            continue
+        append(str(node.val))
+        push(node.right)                 # Right first so left is popped first
+        push(node.left)
     
-    return serialize_helper(root)
+    return ",".join(parts)
 
 def calculate_tree_size(root):
     """
     📏 POSTORDER APPLICATION: Calculate total nodes
     Logic: Count children first, then add current node
+    💡 FAST PATH: Pass a BST to get its cached count in O(1)
     """
+    if isinstance(root, BST):
+        return root.size
+    
     def size_helper(node):
         if not node:
             return 0
@@ -163,27 +371,25 @@ def print_tree_by_levels(root):
     if not root:
         return
     
-    from collections import deque
-    queue = deque([(root, 0)])  # (node, level)
-    current_level = 0
-    level_nodes = []
+    # Double-buffered BFS: one list per level, no (node, level) tuples
+    current = [root]
+    depth = 0
+    lines = []
     
-    while queue:
-        node, level = queue.popleft()
-        
-        if level != current_level:
-            print(f"Level {current_level}: {level_nodes}")
-            level_nodes = []
-            current_level = level
-        
-        level_nodes.append(node.val)
+    while current:
+        lines.append(f"Level {depth}: {[node.val for node in current]}")
         
-        if node.left:
-            queue.append((node.left, level + 1))
-        if node.right:
-            queue.append((node.right, level + 1))
+        next_level = []
+        for node in current:
+            if node.left:
+                next_level.append(node.left)
+            if node.right:
+                next_level.append(node.right)
+        current = next_level
+        depth += 1
     
-    print(f"Level {current_level}: {level_nodes}")
+    # One buffered write for the whole tree instead of a print per level
+    sys.stdout.write("\n".join(lines) + "\n")
 
 # ============================================================================
 # DEMONSTRATION WITH SAMPLE BST
@@ -200,11 +406,9 @@ def demo_traversals():
     1   3 5   7
     """
     
-    # Build sample BST
-    bst = BST()
+    # Build sample BST (balanced, straight from the sorted values)
     values = [4, 2, 6, 1, 3, 5, 7]
-    for val in values:
-        bst.insert(val)
+    bst = BST.from_sorted(sorted(values))
     
     print("🌳 Sample BST with values:", values)
     print("   Tree structure:")
@@ -245,6 +449,7 @@ INORDER (Left → Root → Right):
 ✅ Validate BST property
 ✅ Find kth smallest element
 ✅ Convert BST to sorted array
+✅ Morris variant: sorted output in O(1) extra space
 
 PREORDER (Root → Left → Right):
 ✅ Create copy of tree